@@ -0,0 +1,36 @@
+"""
+Shared chat model construction for the scripts in this repo.
+
+Input data sources: OPENAI_API_KEY from the environment
+Output destinations: None
+Dependencies: langchain-openai
+Key exports: get_llm
+Side effects: None
+"""
+
+import functools
+import json
+
+from langchain_openai import ChatOpenAI
+
+
+@functools.lru_cache(maxsize=8)
+def _build_llm(config: str) -> ChatOpenAI:
+    return ChatOpenAI(**json.loads(config))
+
+
+def get_llm(model: str = "gpt-4o", **kwargs) -> ChatOpenAI:
+    """
+    Return a ChatOpenAI instance for the given configuration, reused across calls.
+
+    The configuration is keyed as JSON so dict-valued settings such as
+    reasoning={"effort": "minimal"} can be cached.
+
+    Args:
+        model: The OpenAI model name
+        **kwargs: Any other JSON-serializable ChatOpenAI settings
+
+    Returns:
+        The cached ChatOpenAI instance
+    """
+    return _build_llm(json.dumps({"model": model, **kwargs}, sort_keys=True))
@@ -4,30 +4,133 @@ Upload movie ratings dataset to LangSmith
 """
 
 import json
-from langsmith import Client
-from dotenv import load_dotenv
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import ijson
+import xxhash
+import sys
+from pathlib import Path
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from env import get_env
+from ls_client import get_client
 
 # Load environment variables
-load_dotenv()
+get_env()
+
+# Examples per create_examples request; keeps each payload well under the
+# upload size limit and scopes retries to a single batch
+BATCH_SIZE = 100
+# Batches are independent HTTP requests, so upload a few in parallel
+MAX_WORKERS = 4
 
-# Load JSON data
+DATASET_NAME = "Movie Ratings Dataset"
+
+# Path to the JSON data
 import os
 script_dir = os.path.dirname(os.path.abspath(__file__))
 json_path = os.path.join(script_dir, "movie_ratings_dataset.json")
-with open(json_path, 'r') as f:
-    examples = json.load(f)
+# Content hashes of examples already uploaded, keyed by dataset ID
+manifest_path = os.path.join(script_dir, ".upload_manifest.json")
+
+
+def example_hash(example):
+    """Return a stable content hash for an example."""
+    return xxhash.xxh64(json.dumps(example, sort_keys=True).encode()).hexdigest()
+
+
+def load_manifest(path):
+    """Load the upload manifest, or an empty one if it does not exist yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_manifest(path, manifest):
+    """Write the upload manifest."""
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def iter_batches(path, batch_size, skip_hashes, counts):
+    """
+    Stream-decode the JSON array at path and yield batches of examples not yet uploaded.
+
+    Only one batch is held in memory at a time, rather than the whole parsed file.
+    Examples whose content hash is in skip_hashes (or repeats earlier in the file) are skipped,
+    and each skipped row is counted in counts["skipped"].
+
+    Yields:
+        Tuples of (examples, hashes) with up to batch_size entries each
+    """
+    seen = set(skip_hashes)
+    with open(path, 'rb') as f:
+        batch, hashes = [], []
+        # use_float=True keeps numbers as floats instead of Decimal so they serialize as JSON
+        for example in ijson.items(f, 'item', use_float=True):
+            digest = example_hash(example)
+            if digest in seen:
+                counts["skipped"] += 1
+                continue
+            seen.add(digest)
+            batch.append(example)
+            hashes.append(digest)
+            if len(batch) >= batch_size:
+                yield batch, hashes
+                batch, hashes = [], []
+        # Flush the final partial batch
+        if batch:
+            yield batch, hashes
+
 
 # Initialize LangSmith client
-client = Client()
+client = get_client()
+
+# Reuse the dataset if it already exists, otherwise create it
+if client.has_dataset(dataset_name=DATASET_NAME):
+    dataset = client.read_dataset(dataset_name=DATASET_NAME)
+else:
+    dataset = client.create_dataset(
+        dataset_name=DATASET_NAME,
+        description="Movie rating predictions based on descriptions and decades"
+    )
 
-# Create dataset
-dataset = client.create_dataset(
-    dataset_name="Movie Ratings Dataset",
-    description="Movie rating predictions based on descriptions and decades"
-)
+# Only examples whose content changed since the last run are uploaded
+manifest = load_manifest(manifest_path)
+uploaded = set(manifest.get(str(dataset.id), []))
+counts: Counter[str] = Counter()
 
-# Upload examples
-client.create_examples(dataset_id=dataset.id, examples=examples)
+# Upload new examples in batches as they are parsed
+total = 0
+submitted = []
+try:
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pending: set[Future] = set()
+        for batch, hashes in iter_batches(json_path, BATCH_SIZE, uploaded, counts):
+            # Cap in-flight batches so parsing never runs far ahead of the uploads
+            if len(pending) >= MAX_WORKERS:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                # result() surfaces any exception raised while uploading a batch
+                for future in done:
+                    future.result()
+            future = executor.submit(
+                client.create_examples, dataset_id=dataset.id, examples=batch
+            )
+            pending.add(future)
+            submitted.append((future, hashes))
+            total += len(batch)
+        for future in pending:
+            future.result()
+finally:
+    # The executor has waited for every batch by now; record each one that succeeded,
+    # even if another failed, so a re-run does not upload it twice
+    for future, hashes in submitted:
+        if not future.cancelled() and future.exception() is None:
+            uploaded.update(hashes)
+    manifest[str(dataset.id)] = sorted(uploaded)
+    save_manifest(manifest_path, manifest)
 
-print(f"✅ Created dataset '{dataset.name}' with {len(examples)} examples")
-print(f"Dataset ID: {dataset.id}")
\ No newline at end of file
+print(f"✅ Uploaded {total} new examples to dataset '{dataset.name}' ({counts['skipped']} unchanged or duplicate examples skipped)")
+print(f"Dataset ID: {dataset.id}")
@@ -0,0 +1,28 @@
+"""
+Shared environment loading for the scripts in this repo.
+
+Input data sources: .env file (found by walking up from the repo root), process environment
+Output destinations: None
+Dependencies: python-dotenv
+Key exports: get_env
+Side effects: Populates os.environ from .env on first call
+"""
+
+import functools
+import os
+
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=1)
+def get_env() -> dict[str, str]:
+    """
+    Load the .env file once per process and return the resulting environment.
+
+    Later calls return the cached snapshot without re-parsing the file.
+
+    Returns:
+        A dictionary of environment variables, e.g. get_env().get("LANGSMITH_API_KEY")
+    """
+    load_dotenv()
+    return dict(os.environ)
@@ -1,92 +1,95 @@
-from langchain_openai import ChatOpenAI
+import functools
+import os
+import sqlite3
+
 from langgraph.graph import MessagesState
 from langchain_core.messages import HumanMessage, SystemMessage
-from IPython.display import Image, display
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode, tools_condition
-from langchain_core.tools import tool
-from langgraph.checkpoint.memory import MemorySaver
-
-
-@tool
-def multiply(a: int, b: int) -> int:
-    """Multiply a and b.
+from langgraph.checkpoint.sqlite import SqliteSaver
+import sys
+from pathlib import Path
 
-    Args:
-        a: first int
-        b: second int
-    """
-    return a * b
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tools.math import add, divide, multiply
+from chat_models import get_llm
 
 
 print(multiply.name)
 print(
     multiply.description
 )  # The function docstring is being taken in as the tool description.
-
-
-# @tool("add_numbers", description="Adds a and b.")
-@tool("add_numbers")
-def add(a: int, b: int) -> int:
-    """Adds a and b.
-
-    Args:
-        a: first int
-        b: second int
-    """
-    return a + b
-
-
 print(add.name)
 print(add.description)
 
 
-@tool
-def divide(a: int, b: int) -> float:
-    """Divide a and b.
-
-    Args:
-        a: first int
-        b: second int
-    """
-    return a / b
-
-
 tools = [add, multiply, divide]
-llm = ChatOpenAI(model="gpt-4o")
+llm = get_llm("gpt-4o")
 
-# For this ipynb we set parallel tool calling to false as math generally is done sequentially, and this time we have 3 tools that can do math
-# the OpenAI model specifically defaults to parallel tool calling for efficiency, see https://python.langchain.com/docs/how_to/tool_calling_parallel/
-# play around with it and see how the model behaves with math equations!
-llm_with_tools = llm.bind_tools(tools, parallel_tool_calls=False)
+# Parallel tool calling is left at the OpenAI default (on), so independent tool calls are issued in a single turn
+# see https://python.langchain.com/docs/how_to/tool_calling_parallel/
+# dependent steps (e.g. "multiply the output") still wait for the previous tool result, as the model tracks the dependency
+# if strict ordering is ever needed, compose the steps inside one @tool rather than disabling parallelism here
+# prompt_cache_key routes every turn to the same OpenAI cache, so the static prefix
+# (tool schemas + system message) is billed at the cached rate once it is long enough (>=1024 tokens)
+llm_with_tools = llm.bind_tools(tools, prompt_cache_key="arithmetic-assistant")
 
 # System message
-sys_msg = SystemMessage(
+# Built once and reused so the prompt prefix is byte-identical on every call.
+# The content is a constant, so model_construct skips Pydantic validation
+sys_msg = SystemMessage.model_construct(
     content="You are a helpful assistant tasked with performing arithmetic on a set of inputs."
 )
 
 
+# Prompt built once at load: static system message first, dynamic conversation last, to keep the prefix cacheable
+prompt_template = ChatPromptTemplate.from_messages(
+    [sys_msg, MessagesPlaceholder("history")]
+)
+chain = prompt_template | llm_with_tools
+
+
 # Node
 def assistant(state: MessagesState):
-    return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
+    return {"messages": [chain.invoke({"history": state["messages"]})]}
+
+
+# Checkpoints persist in a SQLite file next to this script, so a thread's history survives across runs
+# and the earlier messages are resent verbatim (a stable, cacheable prompt prefix).
+# The connection is opened once per process and shared by every graph invocation.
+memory = SqliteSaver(
+    sqlite3.connect(
+        Path(__file__).with_name("checkpoints.sqlite"), check_same_thread=False
+    )
+)
+
+
+# Build and compile the graph once per process
+@functools.lru_cache(maxsize=None)
+def build_graph():
+    # Build graph and add nodes
+    builder = StateGraph(MessagesState)
+    builder.add_node("assistant", assistant)
+    builder.add_node("tools", ToolNode(tools))
+
+    # Workflow edges: Start → Assistant → (tools OR END based on tools_condition)*
+    builder.add_edge(START, "assistant")
+    builder.add_conditional_edges("assistant", tools_condition)
+    builder.add_edge("tools", "assistant")
 
+    # Compile
+    return builder.compile(checkpointer=memory)
 
-# Build graph and add nodes
-builder = StateGraph(MessagesState)
-builder.add_node("assistant", assistant)
-builder.add_node("tools", ToolNode(tools))
 
-# Workflow edges: Start → Assistant → (tools OR END based on tools_condition)*
-builder.add_edge(START, "assistant")
-builder.add_conditional_edges("assistant", tools_condition)
-builder.add_edge("tools", "assistant")
+graph = build_graph()
 
-# Compile
-memory = MemorySaver()
-graph = builder.compile(checkpointer=memory)
+# View, only inside a notebook or when RENDER_GRAPH=1 (draw_mermaid_png makes a network call to mermaid.ink)
+if "ipykernel" in sys.modules or os.getenv("RENDER_GRAPH"):
+    from IPython.display import Image, display
 
-# View
-display(Image(graph.get_graph().draw_mermaid_png()))
+    display(Image(graph.get_graph().draw_mermaid_png()))
 
 # Specify a thread
 config = {"configurable": {"thread_id": "1"}}
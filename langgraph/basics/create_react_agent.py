@@ -1,7 +1,12 @@
 from langchain_core.messages import HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
+import sys
+from pathlib import Path
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from chat_models import get_llm
 
 
 @tool
@@ -10,7 +15,8 @@ def multiply(a: int, b: int):
     return a * b
 
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+# prompt_cache_key routes calls sharing the static system prompt + tool prefix to the same OpenAI cache
+llm = get_llm("gpt-4o-mini", model_kwargs={"prompt_cache_key": "careful-agent"})
 system_prompt = """You are a careful agent. Always explain your reasoning before making tool calls. If a tool fails, provide a helpful error message."""
 
 agent = create_react_agent(
@@ -26,10 +32,8 @@ print("Result:", result)
 # To get the last element from the messages to pass back to the main agent:
 messages = result["messages"]
 
-final_answer = None
-for message in reversed(messages):
-    if isinstance(message, AIMessage):
-        final_answer = message.content
-        break
+# create_react_agent stops on an AIMessage without tool calls, so the last message is the final answer
+final_message = messages[-1]
+final_answer = final_message.content if isinstance(final_message, AIMessage) else None
 
 print("Final Answer:", final_answer)
@@ -1,9 +1,18 @@
+import asyncio
+import functools
+import os
+
 from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage
-from langchain_openai import ChatOpenAI
 from langgraph.graph import MessagesState
-from IPython.display import Image, display
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode, tools_condition
+import sys
+from pathlib import Path
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tools.math import add, multiply
+from chat_models import get_llm
 
 # system_message = SystemMessage(content="You are a helpful assistant.")
 # human_message = HumanMessage(content="What is the capital of France?")
@@ -14,19 +23,8 @@ from langgraph.prebuilt import ToolNode, tools_condition
 # print(messages)
 
 
-# Define tools*
-def add(a: int, b: int) -> int:
-    """Add two numbers."""
-    return a + b
-
-
-def multiply(a: int, b: int) -> int:
-    """Multiply two numbers."""
-    return a * b
-
-
 # LLM with both tools bound*
-llm = ChatOpenAI(model="gpt-4o")
+llm = get_llm("gpt-4o")
 llm_with_tools = llm.bind_tools([add, multiply])
 
 
@@ -35,32 +33,52 @@ def tool_calling_llm(state: MessagesState):
     return {"messages": [llm_with_tools.invoke(state["messages"])]}
 
 
-# Build Graph*
-builder = StateGraph(MessagesState)
-builder.add_node("tool_calling_llm", tool_calling_llm)
+# Build and compile the graph once per process*
+@functools.lru_cache(maxsize=None)
+def build_graph():
+    # Build Graph*
+    builder = StateGraph(MessagesState)
+    builder.add_node("tool_calling_llm", tool_calling_llm)
+
+    # Register both tools with ToolNode*
+    builder.add_node("tools", ToolNode([add, multiply]))
+
+    # Workflow edges: Start → LLM → (tools OR END based on tools_condition)*
+    builder.add_edge(START, "tool_calling_llm")
+    builder.add_conditional_edges(
+        "tool_calling_llm",
+        tools_condition,  # checks if assistant's latest message is a tool call. If it is, it will go directly to the tools node, else it will go to the END node. This is a prebuild thing.
+    )
+    builder.add_edge("tools", END)
+
+    # Compile*
+    return builder.compile()
+
+
+graph = build_graph()
 
-# Register both tools with ToolNode*
-builder.add_node("tools", ToolNode([add, multiply]))
+# View, only inside a notebook or when RENDER_GRAPH=1 (draw_mermaid_png makes a network call to mermaid.ink)
+if "ipykernel" in sys.modules or os.getenv("RENDER_GRAPH"):
+    from IPython.display import Image, display
 
-# Workflow edges: Start → LLM → (tools OR END based on tools_condition)*
-builder.add_edge(START, "tool_calling_llm")
-builder.add_conditional_edges(
-    "tool_calling_llm",
-    tools_condition,  # checks if assistant's latest message is a tool call. If it is, it will go directly to the tools node, else it will go to the END node. This is a prebuild thing.
-)
-builder.add_edge("tools", END)
+    display(Image(graph.get_graph().draw_mermaid_png()))
 
-# Compile*
-graph = builder.compile()
 
-# View
-display(Image(graph.get_graph().draw_mermaid_png()))
+async def main():
+    # The two questions share no state, so run them concurrently
+    results = await asyncio.gather(
+        graph.ainvoke(
+            {"messages": [HumanMessage(content="Hello, what is 2 multiplied by 2?")]}
+        ),
+        graph.ainvoke(
+            {"messages": [HumanMessage(content="Hello, what is 10 plus 2?")]}
+        ),
+    )
 
-messages = [HumanMessage(content="Hello, what is 2 multiplied by 2?")]
-messages = graph.invoke({"messages": messages})
+    for messages in results:
+        for m in messages["messages"]:
+            m.pretty_print()
 
-messages = [HumanMessage(content="Hello, what is 10 plus 2?")]
-messages = graph.invoke({"messages": messages})
 
-for m in messages["messages"]:
-    m.pretty_print()
+if __name__ == "__main__":
+    asyncio.run(main())
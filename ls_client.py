@@ -0,0 +1,32 @@
+"""
+Shared LangSmith client for the scripts in this repo.
+
+Input data sources: LANGSMITH_API_KEY via env.get_env()
+Output destinations: LangSmith API
+Dependencies: langsmith, python-dotenv
+Key exports: get_client
+Side effects: Configures the global LangSmith prompt cache on import
+"""
+
+import functools
+
+from langsmith import Client, configure_global_prompt_cache
+
+from env import get_env
+
+# Serve repeated pull_prompt calls from the in-memory prompt cache
+configure_global_prompt_cache(max_size=32, ttl_seconds=3600)
+
+
+@functools.lru_cache(maxsize=1)
+def get_client() -> Client:
+    """
+    Return the process-wide LangSmith client.
+
+    Reusing one client keeps its HTTP session, and the pooled keep-alive
+    connections, shared across pull_prompt, evaluate and dataset calls.
+
+    Returns:
+        The cached langsmith Client instance
+    """
+    return Client(api_key=get_env().get("LANGSMITH_API_KEY"))
@@ -1,28 +1,57 @@
-from dotenv import load_dotenv
-import os
-from langsmith import Client
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from langchain_core.messages import AIMessage, convert_to_openai_messages
+from langchain_core.runnables import RunnableBinding
+from langchain_openai import ChatOpenAI
+from openai import OpenAI
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from env import get_env
+from ls_client import get_client
 
 """
 This script evaluates a story outline generator using LangSmith.
 
 Key purposes:
 1. Load a stored prompt from LangSmith named "story-outline"
-2. Create an evaluation function that invokes this prompt with inputs. Note that invoke has no streaming hence there is no time to first token.
-3. Run an evaluation using a pre-existing dataset
+2. Create an evaluation function that invokes this prompt with inputs. Note that ainvoke has no streaming hence there is no time to first token.
+3. Run an async evaluation using a pre-existing dataset, with dataset rows evaluated concurrently
 4. Log all interactions to LangSmith for analysis
 
 Requires:
 - A LangSmith account with API key
 - A stored prompt named "story-outline" in your LangSmith account
 - A dataset named "story input" in your LangSmith account
+
+Optional:
+- LS_EVAL_CONCURRENCY: max number of rows evaluated concurrently (default 10).
+  Tune this to the rate-limit headroom of your model provider.
+- LS_EVAL_OFFLINE_BATCH=1 (or the --offline-batch flag): send every dataset row through the
+  OpenAI Batch API instead (50% cheaper, results within 24h) and log the returned outputs
+  as a LangSmith experiment. Meant for nightly runs; interactive work should use the default path.
+  Only supported when the stored prompt's model is a ChatOpenAI Chat Completions model.
 """
 
 # Load environment variables including LANGSMITH_API_KEY
-load_dotenv()
+env = get_env()
 
 # Initialize LangSmith client with API key from environment
-client = Client(api_key=os.getenv("LANGSMITH_API_KEY"))
-    
+client = get_client()
+
+# Number of dataset rows evaluated concurrently
+max_concurrency = int(env.get("LS_EVAL_CONCURRENCY", "10"))
+
+# Use the OpenAI Batch API instead of live calls
+offline_batch = "--offline-batch" in sys.argv or env.get("LS_EVAL_OFFLINE_BATCH") == "1"
+
+# Seconds between batch status checks
+BATCH_POLL_SECONDS = 60
+
 # Pull the story-outline prompt from LangSmith
 # include_model=True means it will include the model configuration
 # This returns a RunnableSequence that can be executed
@@ -30,8 +59,8 @@ prompt = client.pull_prompt("story-outline", include_model=True)
 # Alternative prompt that can be uncommented if needed
 # prompt = client.pull_prompt("story-outline-4omini", include_model=True)
 
-# Define the target function that will be evaluated by LangSmith
-def story_outline_generator(inputs):
+# Define the async target function that will be evaluated by LangSmith
+async def story_outline_generator(inputs):
     """
     Process inputs through the prompt and return the result.
     
@@ -43,11 +72,137 @@ def story_outline_generator(inputs):
         The generated story outline
     """
     # The inputs will be provided by LangSmith from the dataset
-    return prompt.invoke(inputs)
-
-# Run the evaluation using LangSmith's evaluate method
-evaluation_results = client.evaluate(
-    story_outline_generator,           # The function to evaluate
-    data="story input",                # The dataset name in LangSmith
-    experiment_prefix="story-outline-evaluation"  # Prefix for the experiment name
-)
\ No newline at end of file
+    return await prompt.ainvoke(inputs)
+
+# Define the async function to run the evaluation
+async def run():
+    """
+    Run the evaluation using LangSmith's aevaluate.
+
+    Returns:
+        The evaluation results object
+    """
+    return await client.aevaluate(
+        story_outline_generator,           # The async function to evaluate
+        data="story input",                # The dataset name in LangSmith
+        experiment_prefix="story-outline-evaluation",  # Prefix for the experiment name
+        max_concurrency=max_concurrency,   # Run up to N evaluations concurrently
+    )
+
+def build_batch_request(inputs, custom_id):
+    """
+    Render one dataset row into an OpenAI Batch API request line.
+
+    Args:
+        inputs: Dictionary containing input values from the dataset
+        custom_id: Identifier used to match the batch result back to the row
+
+    Returns:
+        A dictionary in the Batch API input file format
+    """
+    # The pulled prompt is the template followed by its model (possibly with bound kwargs)
+    model, model_kwargs = prompt.last, {}
+    if isinstance(model, RunnableBinding):
+        model, model_kwargs = model.bound, model.kwargs
+    if not isinstance(model, ChatOpenAI):
+        raise ValueError("Offline batch mode requires a ChatOpenAI model on the prompt")
+
+    # Build the Chat Completions body from the model's public settings
+    params = {
+        "temperature": model.temperature,
+        "max_completion_tokens": model.max_tokens,
+        "top_p": model.top_p,
+        "frequency_penalty": model.frequency_penalty,
+        "presence_penalty": model.presence_penalty,
+        "seed": model.seed,
+        "n": model.n,
+        "reasoning_effort": model.reasoning_effort,
+    }
+    body = {
+        "model": model.model_name,
+        "messages": convert_to_openai_messages(prompt.first.invoke(inputs).to_messages()),
+        **{key: value for key, value in params.items() if value is not None},
+        **model.model_kwargs,
+        # ls_* kwargs are LangSmith tracing metadata, not OpenAI parameters
+        **{key: value for key, value in model_kwargs.items() if not key.startswith("ls_")},
+    }
+
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": body,
+    }
+
+def run_offline_batch():
+    """
+    Run the dataset through the OpenAI Batch API and log the outputs to LangSmith.
+
+    Returns:
+        The evaluation results object
+    """
+    examples = list(client.list_examples(dataset_name="story input"))
+    openai_client = OpenAI()
+
+    # The evaluation target only sees a row's inputs, so rows with identical inputs
+    # share one request, sent under the ID of the first such row
+    requests = {}
+    for example in examples:
+        requests.setdefault(json.dumps(example.inputs, sort_keys=True), example)
+
+    # Serialize one request per distinct input and submit them as a single batch
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+        batch_path = Path(f.name)
+    try:
+        with open(batch_path, "w") as f:
+            for example in requests.values():
+                f.write(json.dumps(build_batch_request(example.inputs, str(example.id))) + "\n")
+        with open(batch_path, "rb") as batch_input:
+            input_file = openai_client.files.create(file=batch_input, purpose="batch")
+    finally:
+        batch_path.unlink()
+    batch = openai_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"Submitted batch {batch.id} with {len(requests)} requests for {len(examples)} rows")
+
+    # Poll until the batch reaches a terminal state
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(BATCH_POLL_SECONDS)
+        batch = openai_client.batches.retrieve(batch.id)
+        print(f"Batch {batch.id} status: {batch.status}")
+    if batch.output_file_id is None:
+        raise RuntimeError(f"Batch {batch.id} finished with status {batch.status} and no output")
+
+    # Map each batch result back to its distinct input
+    keys_by_id = {str(example.id): key for key, example in requests.items()}
+    outputs = {}
+    for line in openai_client.files.content(batch.output_file_id).text.splitlines():
+        result = json.loads(line)
+        if result.get("response") and result["response"]["status_code"] == 200:
+            message = result["response"]["body"]["choices"][0]["message"]
+            outputs[keys_by_id[result["custom_id"]]] = message["content"]
+
+    def batch_output(inputs):
+        # Rows without a successful batch result raise, so they show up as errors in the experiment
+        content = outputs.get(json.dumps(inputs, sort_keys=True))
+        if content is None:
+            raise RuntimeError("No batch result for this example")
+        return AIMessage(content=content)
+
+    # Log the precomputed outputs as an experiment; no model calls happen here
+    return client.evaluate(
+        batch_output,
+        data=examples,
+        experiment_prefix="story-outline-batch",
+        metadata={"openai_batch_id": batch.id},
+    )
+
+# Execute the evaluation when run directly
+if __name__ == "__main__":
+    if offline_batch:
+        evaluation_results = run_offline_batch()
+    else:
+        evaluation_results = asyncio.run(run())
@@ -1,36 +1,40 @@
-import os
 import asyncio
 import json
-from dotenv import load_dotenv
-from langsmith import Client, traceable
+from langsmith import traceable
 from typing import Dict, Any
+import sys
+from pathlib import Path
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from env import get_env
+from ls_client import get_client
 
 """
-This script demonstrates how to use LangSmith to evaluate a streaming LLM prompt execution.
+This script demonstrates how to use LangSmith to trace an async LLM prompt execution.
 
 Key purposes:
-1. Show how to properly handle streaming outputs in LangSmith evaluations
-2. Measure time to first token and other streaming performance metrics
-3. Compare with non-streaming prompt.invoke() method which doesn't show streaming metrics
-4. Log all streaming interactions to LangSmith for analysis
-5. Demonstrate proper input structure for LangSmith UI visualization
-6. Show how to pass direct parameters to a traced function instead of nested inputs
+1. Show how to trace an async prompt call with the @traceable decorator
+2. Log all interactions to LangSmith for analysis
+3. Demonstrate proper input structure for LangSmith UI visualization
+4. Show how to pass direct parameters to a traced function instead of nested inputs
 
 Requires:
 - A LangSmith account with API key
 - A stored prompt named "fullstory" in your LangSmith account
 
 Notes:
-- The prompts returns a streaming JSON object.
+- The prompt returns a JSON object. It is invoked with ainvoke() since only the complete
+  response is needed; see prompt-stream.py for the streaming / time-to-first-token pattern.
 - Using direct parameters (context, outline) creates a cleaner UI experience in LangSmith.
 - Parameters are mapped to a dictionary internally for compatibility with prompt expectations.
 """
 
 # Load environment variables including LANGSMITH_API_KEY
-load_dotenv()
+get_env()
 
 # Initialize LangSmith client
-client = Client(api_key=os.getenv("LANGSMITH_API_KEY"))
+client = get_client()
 
 # Pull the stored prompt from LangSmith
 # include_model=True means it will include the model configuration
@@ -49,23 +53,18 @@ async def full_story_generator(context: str, outline: str) -> Dict[str, str]:
     Returns:
         A dictionary with 'reason' and 'output' keys
     """
-    # Collect the final chunk which will contain the complete response
-    final_chunk = None
-    
     # Create inputs dictionary for the prompt
     inputs = {
         "context": context,
         "outline": outline
     }
     
-    # Stream the response asynchronously
-    async for chunk in full_story_prompt.astream(inputs):
-        # print(chunk)
-        # Simply save the most recent chunk - the last one will have the complete response
-        final_chunk = chunk
+    # Only the complete response is used, so invoke once instead of streaming
+    # and discarding every intermediate chunk
+    result = await full_story_prompt.ainvoke(inputs)
     
-    # Return the final chunk which has the complete response in the exact format
-    return final_chunk
+    # Return the complete response in the exact format
+    return result
 
 # Sample inputs for testing
 SAMPLE_CONTEXT = "Set in near-future San Francisco where AI technology has become advanced but still not fully trusted by society."
@@ -1,8 +1,12 @@
-import os
 import asyncio
-from dotenv import load_dotenv
-from langsmith import Client
 from typing import Dict, Any
+import sys
+from pathlib import Path
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from env import get_env
+from ls_client import get_client
 
 """
 This script demonstrates how to use LangSmith to evaluate a streaming LLM prompt execution.
@@ -20,10 +24,10 @@ Requires:
 """
 
 # Load environment variables including LANGSMITH_API_KEY
-load_dotenv()
+get_env()
 
 # Initialize LangSmith client
-client = Client(api_key=os.getenv("LANGSMITH_API_KEY"))
+client = get_client()
 
 # Pull the stored prompt from LangSmith
 # include_model=True means it will include the model configuration
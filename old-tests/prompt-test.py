@@ -1,6 +1,10 @@
-from dotenv import load_dotenv
-import os
-from langsmith import Client
+import sys
+from pathlib import Path
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from env import get_env
+from ls_client import get_client
 
 """
 This script is used to generate a story outline based on the given genre and context.
@@ -20,8 +24,8 @@ def generate_story_outline(genre, context):
     Returns:
         The generated story outline
     """
-    load_dotenv()
-    client = Client(api_key=os.getenv("LANGSMITH_API_KEY"))
+    get_env()
+    client = get_client()
     
     # Pull the story-outline prompt from LangSmith
     # prompt = client.pull_prompt("story-outline", include_model=True)
@@ -8,16 +8,25 @@ Key exports: MovieAnalysis (Pydantic model), structured analysis chain
 Side effects: Makes API calls to OpenAI and LangSmith
 """
 
-from langchain_openai import ChatOpenAI
-from langsmith import Client
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+import functools
+from pydantic import BaseModel, ConfigDict, Field
+import sys
+from pathlib import Path
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from env import get_env
+from ls_client import get_client
+from chat_models import get_llm
 
 
 # Define Pydantic model for structured output
 class MovieAnalysis(BaseModel):
     """Structured response for movie story analysis"""
 
+    # Results are read-only; extra="forbid" emits additionalProperties: false for strict structured output
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     response: str = Field(description="The main response analyzing the movie story")
     genre: str = Field(
         description="The primary genre of the movie (e.g., Fantasy, Action, Drama)"
@@ -25,36 +34,50 @@ class MovieAnalysis(BaseModel):
 
 
 # Load environment variables
-load_dotenv()
+get_env()
 
 # Initialize LangSmith client
-client = Client()
+client = get_client()
 
 # Pull the prompt with model settings included
 prompt = client.pull_prompt("gpt5-test")
 
 # Create model without model_kwargs for structured output compatibility
-model = ChatOpenAI(
-    model="gpt-5",
+model = get_llm(
+    "gpt-5",
     output_version="responses/v1",
     reasoning={"effort": "minimal"},  # "minimal", "medium", "high"
     model_kwargs={"text": {"verbosity": "high"}},  # "low", "medium", or "high"
 )
 
+
+# Cached for callers that import this module and reuse the structured model,
+# so the schema is only converted on the first call
+@functools.lru_cache(maxsize=1)
+def get_structured_model():
+    """Return the model wrapped for MovieAnalysis output"""
+    return model.with_structured_output(MovieAnalysis)
+
+
 # Create structured output model
-structured_model = model.with_structured_output(MovieAnalysis)
+structured_model = get_structured_model()
 
 print("model config:", model)
 
 # Create chain with structured output
 chain = prompt | structured_model
 
-# Invoke the prompt
-result = chain.invoke(
+# Stream the prompt so the model streams its tokens and LangSmith records time-to-first-token.
+# The structured output parser only emits once the JSON is complete, so the last chunk is the full result
+result: MovieAnalysis | None = None
+for chunk in chain.stream(
     {
         "story": "A group of unlikely heroes must destroy a powerful ring by throwing it into a volcano while being pursued by evil forces"
     }
-)
+):
+    result = chunk
+if result is None:
+    raise RuntimeError("The structured output stream returned no result")
 
 print("Structured result:")
 print(f"Response: {result.response}")
@@ -2,15 +2,20 @@
 Demo script for using the movie-identifier prompt from LangSmith
 """
 
-import os
-from langsmith import Client
-from dotenv import load_dotenv
+import asyncio
+import sys
+from pathlib import Path
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from env import get_env
+from ls_client import get_client
 
 # Load environment variables
-load_dotenv()
+get_env()
 
 # Initialize LangSmith client
-client = Client()
+client = get_client()
 
 # Pull the prompt with model settings included
 prompt = client.pull_prompt("movie-identifier", include_model=True)
@@ -31,20 +36,37 @@ examples = [
     },
 ]
 
-print("🎬 Movie Identifier Demo\n")
-print("Using prompt:", "movie-identifier")
-print("\n" + "=" * 50 + "\n")
+# Cap in-flight requests to stay within provider rate limits
+MAX_CONCURRENCY = 5
+
+
+async def run_one(example, semaphore):
+    """Invoke the chain for a single example, bounded by the semaphore."""
+    async with semaphore:
+        return await chain.ainvoke(example)
+
+
+async def main():
+    print("🎬 Movie Identifier Demo\n")
+    print("Using prompt:", "movie-identifier")
+    print("\n" + "=" * 50 + "\n")
+
+    # Invoke all examples concurrently; gather preserves input order
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *(run_one(example, semaphore) for example in examples)
+    )
 
-# Process each example
-for i, example in enumerate(examples, 1):
-    print(f"Example {i}:")
-    print(f"Description: {example['movie_description']}")
-    print(f"Decade: {example['decade']}")
+    # Print each example alongside its result
+    for i, (example, result) in enumerate(zip(examples, results), 1):
+        print(f"Example {i}:")
+        print(f"Description: {example['movie_description']}")
+        print(f"Decade: {example['decade']}")
+        print(f"Identified Movie: {result.content}")
+        print("\n" + "-" * 50 + "\n")
 
-    # Invoke the prompt
-    result = chain.invoke(example)
+    print("✅ Demo complete!")
 
-    print(f"Identified Movie: {result.content}")
-    print("\n" + "-" * 50 + "\n")
 
-print("✅ Demo complete!")
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,16 +10,21 @@ Side effects: Makes API calls to OpenAI and LangSmith
 
 from langchain_openai import ChatOpenAI
 from langchain_google_vertexai import ChatVertexAI
-from langsmith import Client
-from dotenv import load_dotenv
 from pydantic import BaseModel, Field
+import sys
+from pathlib import Path
+
+# Make the shared repo-root modules importable when run as a script
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from env import get_env
+from ls_client import get_client
 
 
 # Load environment variables
-load_dotenv()
+get_env()
 
 # Initialize LangSmith client
-client = Client()
+client = get_client()
 
 # Pull the prompt with model settings included
 prompt = client.pull_prompt("util__user-intent-handler", include_model=True)
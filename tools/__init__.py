@@ -0,0 +1 @@
+"""Shared LangChain tools used by the LangGraph examples."""
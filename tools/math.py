@@ -0,0 +1,32 @@
+"""
+Arithmetic tools shared by the LangGraph examples.
+
+Input data sources: Tool call arguments from the LLM
+Output destinations: ToolMessage results in the graph state
+Dependencies: langchain-core
+Key exports: add, multiply, divide
+Side effects: None
+
+Descriptions are kept to one line because the tool schemas are re-sent on every LLM turn;
+argument names and types already come from the type hints.
+"""
+
+from langchain_core.tools import tool
+
+
+@tool("add_numbers")
+def add(a: int, b: int) -> int:
+    """Add a and b."""
+    return a + b
+
+
+@tool
+def multiply(a: int, b: int) -> int:
+    """Multiply a and b."""
+    return a * b
+
+
+@tool
+def divide(a: int, b: int) -> float:
+    """Divide a by b."""
+    return a / b